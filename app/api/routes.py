@@ -1,24 +1,82 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
+import numpy as np
+import orjson
+import pandas as pd
+
 from app.models import (
     StrategyConfig, StrategyConfigRequest, TradeRequest, 
     AccountInfo, AutomationMode, OrderSide, OrderType
 )
 from app.alpaca_client import AlpacaClient
+from app.cache import (
+    DataFrameCache, etag_matches, historical_key, indicator_key, make_etag, ttl_cache,
+    ttl_for_timeframe
+)
+from app.deps import (
+    get_alpaca_client, get_frame_cache, get_scheduler, get_sentiment, get_sentiment_batcher
+)
 from app.scheduler import TradingScheduler
-from app.sentiment import NewsSentimentAnalyzer
+from app.sentiment import NewsSentimentAnalyzer, SentimentBatcher
+from app.strategy import StochasticCCIStrategy, TradingSignal
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Global instances (in production, use dependency injection)
-alpaca_client = AlpacaClient()
-scheduler = TradingScheduler(alpaca_client)
-sentiment_analyzer = NewsSentimentAnalyzer()
+
+async def get_hist_cached(
+    alpaca_client: AlpacaClient,
+    frame_cache: DataFrameCache,
+    symbol: str,
+    timeframe: str,
+    days: int
+) -> pd.DataFrame:
+    """Historical bars for the last `days` days, served from the cache when fresh"""
+    key = historical_key(symbol, timeframe, days)
+    data = await frame_cache.get(key)
+    if data is not None:
+        return data
+    
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    data = await alpaca_client.get_historical_data(
+        symbol, timeframe, start_date, end_date
+    )
+    if not data.empty:
+        await frame_cache.set(key, data, ttl_for_timeframe(timeframe))
+    return data
+
+
+async def get_indicators_cached(
+    frame_cache: DataFrameCache,
+    symbol: str,
+    timeframe: str,
+    days: int,
+    strategy: StochasticCCIStrategy,
+    data: pd.DataFrame
+) -> pd.DataFrame:
+    """Indicator-enriched bars for a strategy's parameters, cached alongside the bars"""
+    key = indicator_key(symbol, timeframe, days, strategy.indicator_params)
+    enriched = await frame_cache.get(key)
+    if enriched is not None:
+        return enriched
+    
+    enriched = await asyncio.to_thread(strategy.calculate_indicators, data)
+    await frame_cache.set(key, enriched, ttl_for_timeframe(timeframe))
+    return enriched
+
+
+def _array_for_json(values: Union[pd.Index, pd.Series]) -> Union[np.ndarray, list]:
+    """Array orjson can serialize with OPT_SERIALIZE_NUMPY; timestamps become epoch milliseconds"""
+    if isinstance(values.dtype, pd.DatetimeTZDtype) or values.dtype.kind == "M":
+        return pd.DatetimeIndex(values).as_unit("ms").asi8
+    array = values.to_numpy()
+    return array.tolist() if array.dtype == object else np.ascontiguousarray(array)
 
 
 @router.get("/health")
@@ -27,303 +85,279 @@ async def health():
 
 
 @router.get("/account")
-async def get_account():
+async def get_account(alpaca_client: AlpacaClient = Depends(get_alpaca_client)):
     """Get account information"""
-    try:
-        account_info = await alpaca_client.get_account_info()
-        return account_info
-    except Exception as e:
-        logger.error(f"Error getting account info: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    account_info = await alpaca_client.get_account_info()
+    return account_info
 
 
 @router.get("/positions")
-async def get_positions():
+async def get_positions(alpaca_client: AlpacaClient = Depends(get_alpaca_client)):
     """Get current positions"""
-    try:
-        positions = await alpaca_client.get_positions()
-        return {"positions": positions}
-    except Exception as e:
-        logger.error(f"Error getting positions: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    positions = await alpaca_client.get_positions()
+    return {"positions": positions}
 
 
 @router.get("/orders")
-async def get_orders(status: str = "all", limit: int = 100):
+async def get_orders(
+    status: str = "all",
+    limit: int = 100,
+    alpaca_client: AlpacaClient = Depends(get_alpaca_client)
+):
     """Get orders"""
-    try:
-        orders = await alpaca_client.get_orders(status=status, limit=limit)
-        return {"orders": orders}
-    except Exception as e:
-        logger.error(f"Error getting orders: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    orders = await alpaca_client.get_orders(status=status, limit=limit)
+    return {"orders": orders}
 
 
 @router.post("/orders")
-async def place_order(order_request: TradeRequest):
+async def place_order(
+    order_request: TradeRequest,
+    alpaca_client: AlpacaClient = Depends(get_alpaca_client)
+):
     """Place a new order"""
-    try:
-        order_result = await alpaca_client.place_order(
-            symbol=order_request.symbol,
-            side=order_request.side,
-            order_type=order_request.order_type,
-            quantity=order_request.quantity,
-            price=order_request.price,
-            stop_price=order_request.stop_price,
-            trail_percent=order_request.trail_percent
-        )
-        return {"order": order_result}
-    except Exception as e:
-        logger.error(f"Error placing order: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    order_result = await alpaca_client.place_order(
+        symbol=order_request.symbol,
+        side=order_request.side,
+        order_type=order_request.order_type,
+        quantity=order_request.quantity,
+        price=order_request.price,
+        stop_price=order_request.stop_price,
+        trail_percent=order_request.trail_percent
+    )
+    return {"order": order_result}
 
 
 @router.delete("/orders/{order_id}")
-async def cancel_order(order_id: str):
+async def cancel_order(order_id: str, alpaca_client: AlpacaClient = Depends(get_alpaca_client)):
     """Cancel an order"""
-    try:
-        success = await alpaca_client.cancel_order(order_id)
-        if success:
-            return {"message": "Order cancelled successfully"}
-        else:
-            raise HTTPException(status_code=400, detail="Failed to cancel order")
-    except Exception as e:
-        logger.error(f"Error cancelling order: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await alpaca_client.cancel_order(order_id)
+    if success:
+        return {"message": "Order cancelled successfully"}
+    else:
+        raise HTTPException(status_code=400, detail="Failed to cancel order")
 
 
 @router.get("/market-status")
-async def get_market_status():
+@ttl_cache(expire=5)
+async def get_market_status(alpaca_client: AlpacaClient = Depends(get_alpaca_client)):
     """Get market status"""
-    try:
-        status = await alpaca_client.get_market_status()
-        return status
-    except Exception as e:
-        logger.error(f"Error getting market status: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    status = await alpaca_client.get_market_status()
+    return status
 
 
 @router.get("/historical-data/{symbol}")
 async def get_historical_data(
     symbol: str,
+    request: Request,
     timeframe: str = "1D",
-    days: int = 30
+    days: int = 30,
+    alpaca_client: AlpacaClient = Depends(get_alpaca_client),
+    frame_cache: DataFrameCache = Depends(get_frame_cache)
 ):
     """Get historical data for a symbol"""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        data = await alpaca_client.get_historical_data(
-            symbol, timeframe, start_date, end_date
-        )
-        
-        # Convert to dict for JSON serialization
-        data_dict = data.to_dict('records') if not data.empty else []
-        
-        return {
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "data": data_dict
-        }
-    except Exception as e:
-        logger.error(f"Error getting historical data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await get_hist_cached(alpaca_client, frame_cache, symbol, timeframe, days)
+    
+    # Column-oriented payload: orjson encodes each column array natively
+    # instead of building one dict per bar
+    payload = {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "index": _array_for_json(data.index),
+        "columns": list(data.columns),
+        "data": [_array_for_json(data[column]) for column in data.columns]
+    }
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    etag = make_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/strategies")
-async def get_strategies():
+@ttl_cache(expire=5)
+async def get_strategies(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Get all strategies"""
-    try:
-        strategies = list(scheduler.strategy_engine.strategies.keys())
-        return {"strategies": strategies}
-    except Exception as e:
-        logger.error(f"Error getting strategies: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    strategies = list(scheduler.strategy_engine.strategies.keys())
+    return {"strategies": strategies}
 
 
 @router.post("/strategies")
-async def create_strategy(config: StrategyConfigRequest):
+async def create_strategy(
+    config: StrategyConfigRequest,
+    scheduler: TradingScheduler = Depends(get_scheduler)
+):
     """Create a new strategy"""
-    try:
-        strategy_config = StrategyConfig(**config.dict())
-        scheduler.add_strategy(strategy_config)
-        return {"message": f"Strategy '{config.name}' created successfully"}
-    except Exception as e:
-        logger.error(f"Error creating strategy: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    strategy_config = StrategyConfig(**config.dict())
+    await asyncio.to_thread(scheduler.add_strategy, strategy_config)
+    _clear_scheduler_caches()
+    return {"message": f"Strategy '{config.name}' created successfully"}
 
 
 @router.delete("/strategies/{strategy_name}")
-async def delete_strategy(strategy_name: str):
+async def delete_strategy(strategy_name: str, scheduler: TradingScheduler = Depends(get_scheduler)):
     """Delete a strategy"""
-    try:
-        scheduler.remove_strategy(strategy_name)
-        return {"message": f"Strategy '{strategy_name}' deleted successfully"}
-    except Exception as e:
-        logger.error(f"Error deleting strategy: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(scheduler.remove_strategy, strategy_name)
+    _clear_scheduler_caches()
+    return {"message": f"Strategy '{strategy_name}' deleted successfully"}
 
 
 @router.get("/watchlist")
-async def get_watchlist():
+@ttl_cache(expire=5)
+async def get_watchlist(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Get current watchlist"""
-    try:
-        return {"watchlist": scheduler.watchlist}
-    except Exception as e:
-        logger.error(f"Error getting watchlist: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"watchlist": scheduler.watchlist}
 
 
 @router.post("/watchlist")
-async def set_watchlist(symbols: List[str]):
+async def set_watchlist(symbols: List[str], scheduler: TradingScheduler = Depends(get_scheduler)):
     """Set the watchlist"""
-    try:
-        scheduler.set_watchlist(symbols)
-        return {"message": f"Watchlist updated with {len(symbols)} symbols"}
-    except Exception as e:
-        logger.error(f"Error setting watchlist: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(scheduler.set_watchlist, symbols)
+    _clear_scheduler_caches()
+    return {"message": f"Watchlist updated with {len(symbols)} symbols"}
 
 
 @router.get("/scheduler/status")
-async def get_scheduler_status():
+@ttl_cache(expire=5)
+async def get_scheduler_status(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Get scheduler status"""
-    try:
-        status = scheduler.get_status()
-        return status
-    except Exception as e:
-        logger.error(f"Error getting scheduler status: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    status = await asyncio.to_thread(scheduler.get_status)
+    return status
 
 
 @router.post("/scheduler/start")
-async def start_scheduler():
+async def start_scheduler(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Start the trading scheduler"""
-    try:
-        scheduler.start()
-        return {"message": "Scheduler started successfully"}
-    except Exception as e:
-        logger.error(f"Error starting scheduler: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Stays on the event loop: asyncio-based APScheduler schedulers bind to the running loop
+    scheduler.start()
+    _clear_scheduler_caches()
+    return {"message": "Scheduler started successfully"}
 
 
 @router.post("/scheduler/stop")
-async def stop_scheduler():
+async def stop_scheduler(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Stop the trading scheduler"""
-    try:
-        scheduler.stop()
-        return {"message": "Scheduler stopped successfully"}
-    except Exception as e:
-        logger.error(f"Error stopping scheduler: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    scheduler.stop()
+    _clear_scheduler_caches()
+    return {"message": "Scheduler stopped successfully"}
+
+
+def _clear_scheduler_caches() -> None:
+    """Drop cached scheduler reads after a route changes scheduler state"""
+    get_strategies.cache_clear()
+    get_watchlist.cache_clear()
+    get_scheduler_status.cache_clear()
 
 
 @router.get("/pending-signals")
-async def get_pending_signals():
+async def get_pending_signals(scheduler: TradingScheduler = Depends(get_scheduler)):
     """Get pending signals for manual confirmation"""
-    try:
-        signals = scheduler.get_pending_signals()
-        return {"pending_signals": signals}
-    except Exception as e:
-        logger.error(f"Error getting pending signals: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    signals = await asyncio.to_thread(scheduler.get_pending_signals)
+    return {"pending_signals": signals}
+
+
+async def pending_signal(
+    signal_id: str,
+    scheduler: TradingScheduler = Depends(get_scheduler)
+) -> TradingSignal:
+    """Resolve a path signal_id to the matching pending signal (404 if it is no longer pending)"""
+    signals = await asyncio.to_thread(scheduler.get_pending_signals)
+    signal = next((s for s in signals if s.id == signal_id), None)
+    if signal is None:
+        raise HTTPException(status_code=404, detail="Signal not found")
+    return signal
 
 
 @router.post("/pending-signals/{signal_id}/confirm")
-async def confirm_signal(signal_id: str):
+async def confirm_signal(
+    signal: TradingSignal = Depends(pending_signal),
+    scheduler: TradingScheduler = Depends(get_scheduler)
+):
     """Confirm a pending signal"""
-    try:
-        # Find signal by ID (simplified - in production use proper ID matching)
-        signals = scheduler.get_pending_signals()
-        signal = next((s for s in signals if s.symbol == signal_id), None)
-        
-        if not signal:
-            raise HTTPException(status_code=404, detail="Signal not found")
-        
-        success = scheduler.confirm_signal(signal)
-        if success:
-            return {"message": "Signal confirmed and executed"}
-        else:
-            raise HTTPException(status_code=400, detail="Failed to confirm signal")
-    except Exception as e:
-        logger.error(f"Error confirming signal: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Stays on the event loop like start/stop: confirming executes the order through
+    # the async AlpacaClient, which needs the running loop
+    success = scheduler.confirm_signal(signal)
+    _clear_scheduler_caches()
+    if success:
+        return {"message": "Signal confirmed and executed"}
+    else:
+        raise HTTPException(status_code=400, detail="Failed to confirm signal")
 
 
 @router.post("/pending-signals/{signal_id}/reject")
-async def reject_signal(signal_id: str):
+async def reject_signal(
+    signal: TradingSignal = Depends(pending_signal),
+    scheduler: TradingScheduler = Depends(get_scheduler)
+):
     """Reject a pending signal"""
-    try:
-        # Find signal by ID (simplified - in production use proper ID matching)
-        signals = scheduler.get_pending_signals()
-        signal = next((s for s in signals if s.symbol == signal_id), None)
-        
-        if not signal:
-            raise HTTPException(status_code=404, detail="Signal not found")
-        
-        success = scheduler.reject_signal(signal)
-        if success:
-            return {"message": "Signal rejected"}
-        else:
-            raise HTTPException(status_code=400, detail="Failed to reject signal")
-    except Exception as e:
-        logger.error(f"Error rejecting signal: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = scheduler.reject_signal(signal)
+    _clear_scheduler_caches()
+    if success:
+        return {"message": "Signal rejected"}
+    else:
+        raise HTTPException(status_code=400, detail="Failed to reject signal")
 
 
 @router.get("/sentiment/{symbol}")
-async def get_sentiment(symbol: str, hours_back: int = 24):
+async def get_symbol_sentiment(
+    symbol: str,
+    hours_back: int = 24,
+    sentiment_batcher: SentimentBatcher = Depends(get_sentiment_batcher)
+):
     """Get sentiment analysis for a symbol"""
-    try:
-        sentiment_data = await sentiment_analyzer.get_sentiment_for_symbols(
-            [symbol], hours_back
-        )
-        return sentiment_data.get(symbol, {})
-    except Exception as e:
-        logger.error(f"Error getting sentiment: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await sentiment_batcher.submit(symbol, hours_back)
 
 
 @router.get("/sentiment/market")
-async def get_market_sentiment(hours_back: int = 24):
+async def get_market_sentiment(
+    hours_back: int = 24,
+    sentiment_analyzer: NewsSentimentAnalyzer = Depends(get_sentiment)
+):
     """Get overall market sentiment"""
-    try:
-        sentiment = await sentiment_analyzer.get_market_sentiment(hours_back)
-        return sentiment
-    except Exception as e:
-        logger.error(f"Error getting market sentiment: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    sentiment = await sentiment_analyzer.get_market_sentiment(hours_back)
+    return sentiment
 
 
 @router.get("/analyze/{symbol}")
-async def analyze_symbol(symbol: str, timeframe: str = "1D"):
+async def analyze_symbol(
+    symbol: str,
+    timeframe: str = "1D",
+    alpaca_client: AlpacaClient = Depends(get_alpaca_client),
+    scheduler: TradingScheduler = Depends(get_scheduler),
+    frame_cache: DataFrameCache = Depends(get_frame_cache)
+):
     """Analyze a symbol for trading signals"""
-    try:
-        # Get historical data
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365)
-        
-        data = await alpaca_client.get_historical_data(
-            symbol, timeframe, start_date, end_date
-        )
-        
+    engine = scheduler.strategy_engine
+    groups = engine.active_strategy_groups()
+    max_age = ttl_for_timeframe(timeframe)
+    
+    # Prefer indicators warmed by the scheduler's last analysis pass
+    warm = {
+        params: engine.cached_indicators(symbol, timeframe, params, max_age)
+        for params in groups
+    }
+    
+    days = 365
+    data = None
+    if not warm or any(enriched is None for enriched in warm.values()):
+        data = await get_hist_cached(alpaca_client, frame_cache, symbol, timeframe, days)
         if data.empty:
             raise HTTPException(status_code=404, detail="No data available for symbol")
-        
-        # Analyze with all active strategies
-        signals = []
-        for strategy_name, strategy in scheduler.strategy_engine.strategies.items():
-            if strategy.config.is_active:
-                signal = strategy.analyze_symbol(symbol, data, timeframe)
-                if signal:
-                    signals.append(signal)
-        
-        return {
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "signals": signals
-        }
-    except Exception as e:
-        logger.error(f"Error analyzing symbol: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Analyze with all active strategies, one indicator pass per distinct setting
+    signals = []
+    for params, strategies in groups.items():
+        enriched = warm[params]
+        if enriched is None:
+            enriched = await get_indicators_cached(
+                frame_cache, symbol, timeframe, days, strategies[0], data
+            )
+        for strategy in strategies:
+            signal = strategy.analyze_indicators(symbol, enriched, timeframe)
+            if signal:
+                signals.append(signal)
+    
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "signals": signals
+    }
@@ -0,0 +1,129 @@
+import functools
+import hashlib
+import io
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+from redis import asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+_TIMEFRAME_RE = re.compile(r"^(\d*)\s*(min|t|h|hour|d|day|w|week|m|month)$", re.IGNORECASE)
+_UNIT_SECONDS = {
+    'min': 60, 't': 60,
+    'h': 3600, 'hour': 3600,
+    'd': 86400, 'day': 86400,
+    'w': 604800, 'week': 604800,
+    'm': 2592000, 'month': 2592000,
+}
+MAX_TTL_SECONDS = 3600
+DEFAULT_TTL_SECONDS = 300
+
+
+def ttl_for_timeframe(timeframe: str) -> int:
+    """
+    How long cached bars for a timeframe stay fresh
+    
+    One bar's duration, capped at an hour (1Min -> 60s, 30Min -> 30min, 1D -> 1h).
+    """
+    match = _TIMEFRAME_RE.match(timeframe.strip())
+    if not match:
+        return DEFAULT_TTL_SECONDS
+    count = int(match.group(1) or 1)
+    return min(count * _UNIT_SECONDS[match.group(2).lower()], MAX_TTL_SECONDS)
+
+
+def historical_key(symbol: str, timeframe: str, days: int) -> str:
+    return f"hist:{symbol.upper()}:{timeframe}:{days}"
+
+
+def indicator_key(symbol: str, timeframe: str, days: int, params: Dict[str, Any]) -> str:
+    digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return f"ind:{symbol.upper()}:{timeframe}:{days}:{digest}"
+
+
+class DataFrameCache:
+    """Redis-backed cache for bar and indicator DataFrames, stored as Parquet"""
+    
+    def __init__(self, redis_url: Optional[str] = None):
+        # Caching is disabled (every lookup misses) when no Redis URL is configured
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+    
+    async def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached DataFrame for key, or None on a miss"""
+        if self._redis is None:
+            return None
+        try:
+            payload = await self._redis.get(key)
+            if payload is None:
+                return None
+            return pd.read_parquet(io.BytesIO(payload))
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+    
+    async def set(self, key: str, df: pd.DataFrame, ttl: int) -> None:
+        """Store a DataFrame under key for ttl seconds"""
+        if self._redis is None:
+            return
+        try:
+            buffer = io.BytesIO()
+            df.to_parquet(buffer)
+            await self._redis.setex(key, ttl, buffer.getvalue())
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+    
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+def ttl_cache(expire: float, maxsize: int = 128) -> Callable:
+    """
+    Cache an async function's result in-process for `expire` seconds
+    
+    Entries are keyed on the call arguments and evicted LRU past `maxsize`. The
+    wrapper exposes cache_clear() so routes that change the underlying state can
+    drop stale responses immediately.
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = entries.get(key)
+            if hit is not None and now - hit[0] < expire:
+                entries.move_to_end(key)
+                return hit[1]
+            
+            result = await func(*args, **kwargs)
+            entries[key] = (now, result)
+            entries.move_to_end(key)
+            if len(entries) > maxsize:
+                entries.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
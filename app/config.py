@@ -1,8 +1,13 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Optional
+
 from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", frozen=True)
+
     alpaca_api_key: str = Field(alias="ALPACA_API_KEY")
     alpaca_secret_key: str = Field(alias="ALPACA_SECRET_KEY")
     alpaca_base_url: str = Field(alias="ALPACA_BASE_URL", default="https://paper-api.alpaca.markets")
@@ -10,10 +15,13 @@ class Settings(BaseSettings):
     env: str = Field(alias="ENV", default="development")
     db_url: str = Field(alias="DB_URL", default="sqlite:///./trading.db")
     port: int = Field(alias="PORT", default=8000)
+    redis_url: Optional[str] = Field(alias="REDIS_URL", default=None)
+
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings, parsed from the environment and .env once"""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,35 @@
+from functools import lru_cache
+
+from app.alpaca_client import AlpacaClient
+from app.cache import DataFrameCache
+from app.config import get_settings
+from app.scheduler import TradingScheduler
+from app.sentiment import NewsSentimentAnalyzer, SentimentBatcher
+
+
+# Process-wide instances, created on first use and injected into routes with Depends()
+
+
+@lru_cache(maxsize=1)
+def get_alpaca_client() -> AlpacaClient:
+    return AlpacaClient()
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> TradingScheduler:
+    return TradingScheduler(get_alpaca_client())
+
+
+@lru_cache(maxsize=1)
+def get_sentiment() -> NewsSentimentAnalyzer:
+    return NewsSentimentAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_batcher() -> SentimentBatcher:
+    return SentimentBatcher(get_sentiment())
+
+
+@lru_cache(maxsize=1)
+def get_frame_cache() -> DataFrameCache:
+    return DataFrameCache(get_settings().redis_url)
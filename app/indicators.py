@@ -2,9 +2,305 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 import logging
+from numba import njit
 
 logger = logging.getLogger(__name__)
 
+_BB_RESYNC = 1024
+
+
+@njit(cache=True)
+def _ewm_step(weighted, old_wt, value, alpha):
+    """Advance one observation of pandas' adjusted EWM mean (ignore_na=False)"""
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if value == value:
+            weighted = (old_wt * weighted + value) / (old_wt + 1.0)
+            old_wt += 1.0
+    elif value == value:
+        weighted = value
+        old_wt = 1.0
+    return weighted, old_wt
+
+
+@njit(cache=True)
+def _ema_kernel(values, alpha):
+    """EMA equivalent to ``Series.ewm(alpha=alpha).mean()`` in a single pass"""
+    n = len(values)
+    out = np.empty(n)
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        weighted, old_wt = _ewm_step(weighted, old_wt, values[i], alpha)
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def _macd_kernel(close, alpha_fast, alpha_slow, alpha_signal):
+    """Fast/slow EMA, MACD line, signal line and histogram fused into one pass"""
+    n = len(close)
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    histogram = np.empty(n)
+    ema_fast = ema_slow = signal = np.nan
+    wt_fast = wt_slow = wt_signal = 1.0
+    for i in range(n):
+        ema_fast, wt_fast = _ewm_step(ema_fast, wt_fast, close[i], alpha_fast)
+        ema_slow, wt_slow = _ewm_step(ema_slow, wt_slow, close[i], alpha_slow)
+        m = ema_fast - ema_slow
+        signal, wt_signal = _ewm_step(signal, wt_signal, m, alpha_signal)
+        macd_line[i] = m
+        signal_line[i] = signal
+        histogram[i] = m - signal
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=True)
+def _rsi_kernel(close, period):
+    """RSI with Wilder's smoothing, seeded by the SMA of the first ``period`` changes"""
+    n = len(close)
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    count = 0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta != delta:
+            continue
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if count < period:
+            avg_gain += gain
+            avg_loss += loss
+            count += 1
+            if count < period:
+                continue
+            avg_gain /= period
+            avg_loss /= period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            out[i] = 100.0
+    return out
+
+
+@njit(cache=True)
+def _bbands_kernel(close, period, k):
+    """Bollinger bands (sample std) from a running sum and sum of squares in one pass"""
+    n = len(close)
+    upper = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    # Sums are taken over values shifted by a recent close to limit cancellation in
+    # s2 - s*s/p, and re-accumulated exactly every _BB_RESYNC bars to bound drift
+    shift = 0.0
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    next_resync = 0
+    for i in range(n):
+        if i >= next_resync and close[i] == close[i]:
+            next_resync = i + _BB_RESYNC
+            shift = close[i]
+            s = 0.0
+            s2 = 0.0
+            nan_count = 0
+            for j in range(max(0, i - period + 1), i + 1):
+                x = close[j] - shift
+                if x == x:
+                    s += x
+                    s2 += x * x
+                else:
+                    nan_count += 1
+        else:
+            x = close[i] - shift
+            if x == x:
+                s += x
+                s2 += x * x
+            else:
+                nan_count += 1
+            if i >= period:
+                old = close[i - period] - shift
+                if old == old:
+                    s -= old
+                    s2 -= old * old
+                else:
+                    nan_count -= 1
+        if i >= period - 1 and nan_count == 0:
+            mean = s / period
+            var = (s2 - s * s / period) / (period - 1)
+            sd = np.sqrt(var) if var > 0 else 0.0
+            middle[i] = mean + shift
+            upper[i] = middle[i] + k * sd
+            lower[i] = middle[i] - k * sd
+    return upper, middle, lower
+
+
+@njit(cache=True)
+def _rolling_extreme(values, k, is_max):
+    """Rolling max (or min) with a monotonic index deque, O(N) for any window"""
+    n = len(values)
+    out = np.full(n, np.nan)
+    deque = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    last_nan = -1
+    for i in range(n):
+        v = values[i]
+        if v != v:
+            last_nan = i
+        else:
+            while tail > head and (
+                values[deque[tail - 1]] <= v if is_max else values[deque[tail - 1]] >= v
+            ):
+                tail -= 1
+            deque[tail] = i
+            tail += 1
+        while tail > head and deque[head] <= i - k:
+            head += 1
+        # Match pandas: any NaN inside the window makes the result NaN
+        if i >= k - 1 and last_nan <= i - k and tail > head:
+            out[i] = values[deque[head]]
+    return out
+
+
+@njit(cache=True)
+def _rolling_min(values, k):
+    return _rolling_extreme(values, k, False)
+
+
+@njit(cache=True)
+def _rolling_max(values, k):
+    return _rolling_extreme(values, k, True)
+
+
+def _windows(values: np.ndarray, period: int) -> np.ndarray:
+    """2-D sliding window view of ``values`` (no rows when shorter than ``period``)"""
+    if len(values) < period:
+        return np.empty((0, period))
+    return np.lib.stride_tricks.sliding_window_view(values, period)
+
+
+def _leading_nan(core: np.ndarray, n: int) -> np.ndarray:
+    """Left-pad a per-window result with NaN back to the input length"""
+    out = np.full(n, np.nan)
+    if len(core):
+        out[n - len(core):] = core
+    return out
+
+
+def _stochastic_np(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(close)
+    lowest_low = _rolling_min(low, k_period)
+    highest_high = _rolling_max(high, k_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    d_percent = _leading_nan(_windows(k_percent, d_period).mean(axis=1), n)
+    return k_percent, d_percent
+
+
+def _typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high + low + close) / 3
+
+
+def _cci_np(typical_price: np.ndarray, period: int) -> np.ndarray:
+    n = len(typical_price)
+    windows = _windows(typical_price, period)
+    window_mean = windows.mean(axis=1, keepdims=True)
+    sma_tp = _leading_nan(window_mean[:, 0], n)
+    mean_deviation = _leading_nan(np.abs(windows - window_mean).mean(axis=1), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (typical_price - sma_tp) / (0.015 * mean_deviation)
+
+
+def _moving_average_np(close: np.ndarray, period: int, ma_type: str) -> np.ndarray:
+    ma_type = ma_type.lower()
+    if ma_type == "sma":
+        return _leading_nan(_windows(close, period).mean(axis=1), len(close))
+    elif ma_type == "ema":
+        return _ema_kernel(close, 2.0 / (period + 1))
+    elif ma_type == "wma":
+        weights = np.arange(1, period + 1, dtype=np.float64)
+        weights /= weights.sum()
+        return _leading_nan(_windows(close, period) @ weights, len(close))
+    raise ValueError(f"Unknown MA type: {ma_type}")
+
+
+def _bollinger_np(
+    close: np.ndarray,
+    period: int,
+    std_dev: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if period < 2:
+        # The sample std of fewer than two closes is undefined: NaN bands around
+        # the rolling mean, as pandas gives
+        middle = close.copy() if period == 1 else np.full(len(close), np.nan)
+        return np.full(len(close), np.nan), middle, np.full(len(close), np.nan)
+    return _bbands_kernel(close, period, std_dev)
+
+
+def _macd_np(
+    close: np.ndarray,
+    fast_period: int,
+    slow_period: int,
+    signal_period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _macd_kernel(
+        close,
+        2.0 / (fast_period + 1),
+        2.0 / (slow_period + 1),
+        2.0 / (signal_period + 1)
+    )
+
+
+def _all_indicators_np(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    stoch_k_period: int,
+    stoch_d_period: int,
+    cci_period: int,
+    rsi_period: int,
+    ma_period: int,
+    bb_period: int,
+    bb_std: float,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int
+) -> Dict[str, np.ndarray]:
+    """Compute every indicator column from contiguous OHLC arrays"""
+    typical_price = _typical_price(high, low, close)
+    stoch_k, stoch_d = _stochastic_np(high, low, close, stoch_k_period, stoch_d_period)
+    bb_upper, bb_middle, bb_lower = _bollinger_np(close, bb_period, bb_std)
+    # The SMA is the Bollinger middle band whenever the periods line up
+    sma = bb_middle if ma_period == bb_period else _moving_average_np(close, ma_period, "sma")
+    macd_line, signal_line, histogram = _macd_np(close, macd_fast, macd_slow, macd_signal)
+    
+    return {
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_d,
+        'cci': _cci_np(typical_price, cci_period),
+        'rsi': _rsi_kernel(close, rsi_period),
+        'sma': sma,
+        'ema': _moving_average_np(close, ma_period, "ema"),
+        'bb_upper': bb_upper,
+        'bb_middle': bb_middle,
+        'bb_lower': bb_lower,
+        'macd': macd_line,
+        'macd_signal': signal_line,
+        'macd_histogram': histogram,
+    }
+
 
 class TechnicalIndicators:
     """Technical indicators for trading strategies"""
@@ -31,16 +327,14 @@ class TechnicalIndicators:
             Tuple of (%K, %D) series
         """
         try:
-            # Calculate %K
-            lowest_low = low.rolling(window=k_period).min()
-            highest_high = high.rolling(window=k_period).max()
-            
-            k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-            
-            # Calculate %D (SMA of %K)
-            d_percent = k_percent.rolling(window=d_period).mean()
-            
-            return k_percent, d_percent
+            k_percent, d_percent = _stochastic_np(
+                high.to_numpy(dtype=np.float64),
+                low.to_numpy(dtype=np.float64),
+                close.to_numpy(dtype=np.float64),
+                k_period,
+                d_period
+            )
+            return pd.Series(k_percent, index=close.index), pd.Series(d_percent, index=close.index)
         except Exception as e:
             logger.error(f"Error calculating Stochastic Oscillator: {e}")
             return pd.Series(), pd.Series()
@@ -65,21 +359,13 @@ class TechnicalIndicators:
             CCI series
         """
         try:
-            # Calculate Typical Price
-            typical_price = (high + low + close) / 3
-            
-            # Calculate Simple Moving Average of Typical Price
-            sma_tp = typical_price.rolling(window=period).mean()
-            
-            # Calculate Mean Deviation
-            mean_deviation = typical_price.rolling(window=period).apply(
-                lambda x: np.mean(np.abs(x - x.mean()))
+            typical_price = _typical_price(
+                high.to_numpy(dtype=np.float64),
+                low.to_numpy(dtype=np.float64),
+                close.to_numpy(dtype=np.float64)
             )
-            
-            # Calculate CCI
-            cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
-            
-            return cci
+            cci = _cci_np(typical_price, period)
+            return pd.Series(cci, index=close.index)
         except Exception as e:
             logger.error(f"Error calculating CCI: {e}")
             return pd.Series()
@@ -97,14 +383,7 @@ class TechnicalIndicators:
             RSI series
         """
         try:
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            return pd.Series(_rsi_kernel(close.to_numpy(dtype=np.float64), period), index=close.index)
         except Exception as e:
             logger.error(f"Error calculating RSI: {e}")
             return pd.Series()
@@ -123,17 +402,8 @@ class TechnicalIndicators:
             Moving average series
         """
         try:
-            if ma_type.lower() == "sma":
-                return close.rolling(window=period).mean()
-            elif ma_type.lower() == "ema":
-                return close.ewm(span=period).mean()
-            elif ma_type.lower() == "wma":
-                weights = np.arange(1, period + 1)
-                return close.rolling(window=period).apply(
-                    lambda x: np.dot(x, weights) / weights.sum(), raw=True
-                )
-            else:
-                raise ValueError(f"Unknown MA type: {ma_type}")
+            ma = _moving_average_np(close.to_numpy(dtype=np.float64), period, ma_type)
+            return pd.Series(ma, index=close.index)
         except Exception as e:
             logger.error(f"Error calculating Moving Average: {e}")
             return pd.Series()
@@ -156,13 +426,8 @@ class TechnicalIndicators:
             Tuple of (upper_band, middle_band, lower_band)
         """
         try:
-            middle_band = close.rolling(window=period).mean()
-            std = close.rolling(window=period).std()
-            
-            upper_band = middle_band + (std * std_dev)
-            lower_band = middle_band - (std * std_dev)
-            
-            return upper_band, middle_band, lower_band
+            bands = _bollinger_np(close.to_numpy(dtype=np.float64), period, std_dev)
+            return tuple(pd.Series(band, index=close.index) for band in bands)
         except Exception as e:
             logger.error(f"Error calculating Bollinger Bands: {e}")
             return pd.Series(), pd.Series(), pd.Series()
@@ -187,14 +452,10 @@ class TechnicalIndicators:
             Tuple of (macd_line, signal_line, histogram)
         """
         try:
-            ema_fast = close.ewm(span=fast_period).mean()
-            ema_slow = close.ewm(span=slow_period).mean()
-            
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal_period).mean()
-            histogram = macd_line - signal_line
-            
-            return macd_line, signal_line, histogram
+            lines = _macd_np(
+                close.to_numpy(dtype=np.float64), fast_period, slow_period, signal_period
+            )
+            return tuple(pd.Series(line, index=close.index) for line in lines)
         except Exception as e:
             logger.error(f"Error calculating MACD: {e}")
             return pd.Series(), pd.Series(), pd.Series()
@@ -224,44 +485,23 @@ class TechnicalIndicators:
             DataFrame with all indicators added
         """
         try:
-            result_df = df.copy()
-            
-            # Stochastic Oscillator
-            stoch_k, stoch_d = TechnicalIndicators.stochastic_oscillator(
-                df['high'], df['low'], df['close'], stoch_k_period, stoch_d_period
-            )
-            result_df['stoch_k'] = stoch_k
-            result_df['stoch_d'] = stoch_d
-            
-            # CCI
-            result_df['cci'] = TechnicalIndicators.commodity_channel_index(
-                df['high'], df['low'], df['close'], cci_period
+            # Pull OHLC out of the frame once and attach every column in one assign()
+            indicators = _all_indicators_np(
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                df['close'].to_numpy(dtype=np.float64),
+                stoch_k_period=stoch_k_period,
+                stoch_d_period=stoch_d_period,
+                cci_period=cci_period,
+                rsi_period=rsi_period,
+                ma_period=ma_period,
+                bb_period=bb_period,
+                bb_std=bb_std,
+                macd_fast=macd_fast,
+                macd_slow=macd_slow,
+                macd_signal=macd_signal
             )
-            
-            # RSI
-            result_df['rsi'] = TechnicalIndicators.rsi(df['close'], rsi_period)
-            
-            # Moving Averages
-            result_df['sma'] = TechnicalIndicators.moving_average(df['close'], ma_period, 'sma')
-            result_df['ema'] = TechnicalIndicators.moving_average(df['close'], ma_period, 'ema')
-            
-            # Bollinger Bands
-            bb_upper, bb_middle, bb_lower = TechnicalIndicators.bollinger_bands(
-                df['close'], bb_period, bb_std
-            )
-            result_df['bb_upper'] = bb_upper
-            result_df['bb_middle'] = bb_middle
-            result_df['bb_lower'] = bb_lower
-            
-            # MACD
-            macd_line, signal_line, histogram = TechnicalIndicators.macd(
-                df['close'], macd_fast, macd_slow, macd_signal
-            )
-            result_df['macd'] = macd_line
-            result_df['macd_signal'] = signal_line
-            result_df['macd_histogram'] = histogram
-            
-            return result_df
+            return df.assign(**indicators)
         except Exception as e:
             logger.error(f"Error calculating all indicators: {e}")
             return df
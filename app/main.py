@@ -1,14 +1,35 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
 
 from app.config import settings
 from app.api.routes import router as api_router
+from app.deps import get_frame_cache, get_sentiment, get_sentiment_batcher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_sentiment_batcher().start()
+    yield
+    await get_sentiment_batcher().stop()
+    await get_sentiment().aclose()
+    await get_frame_cache().close()
 
 
-app = FastAPI(title="AlpaTrade Bot", version="0.1.0")
+app = FastAPI(
+    title="AlpaTrade Bot",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +41,14 @@ app.add_middleware(
 
 app.include_router(api_router, prefix="/api")
 
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Log any error a route does not handle and report it as a 500"""
+    logger.exception(f"Unhandled error on {request.method} {request.url.path}: {exc}")
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
+
+
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 templates = Jinja2Templates(directory="app/templates")
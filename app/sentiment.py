@@ -1,20 +1,114 @@
 import feedparser
+import functools
+import hashlib
 import httpx
+import io
+from dateutil import parser as du_parser
+from dateutil import tz
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, ClassVar, IO, Mapping, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
 import logging
 import re
 import asyncio
+import threading
+import time
+import uuid
 
 from app.models import NewsItem
 
+try:
+    import ahocorasick
+except ImportError:  # optional; symbol matching falls back to one compiled regex
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Runs of four or more identical emoticons, collapsed to three before scoring so
+# pathological inputs can't trigger VADER's slow emoji handling
+_EMOTICON_RUN = re.compile(r'([:;=]-?[)D(Pp])\1{3,}')
+
+# Zone abbreviations seen in RSS dates, resolved once for dateutil
+TZINFOS = {
+    'UTC': tz.UTC,
+    'GMT': tz.UTC,
+    'EST': tz.gettz('America/New_York'),
+    'EDT': tz.gettz('America/New_York'),
+    'CST': tz.gettz('America/Chicago'),
+    'CDT': tz.gettz('America/Chicago'),
+    'MST': tz.gettz('America/Denver'),
+    'MDT': tz.gettz('America/Denver'),
+    'PST': tz.gettz('America/Los_Angeles'),
+    'PDT': tz.gettz('America/Los_Angeles')
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _symbol_matcher(symbols: frozenset) -> Callable[[str], Set[str]]:
+    """
+    Build a single-pass matcher for symbols and their company-name patterns
+    
+    The returned function takes lowercased text and returns the symbols whose
+    lowercased ticker or patterns occur in it. Uses an Aho-Corasick automaton
+    when pyahocorasick is installed, otherwise one regex alternation per symbol.
+    """
+    # Several symbols can share a pattern, so each word maps to a set
+    words: Dict[str, Set[str]] = {}
+    for symbol in symbols:
+        for pattern in (symbol.lower(), *NewsSentimentAnalyzer.SYMBOL_PATTERNS.get(symbol, ())):
+            words.setdefault(pattern, set()).add(symbol)
+    
+    # An automaton with no words can't be searched
+    if not words:
+        return lambda text: set()
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word, word_symbols in words.items():
+            automaton.add_word(word, word_symbols)
+        automaton.make_automaton()
+        
+        def match(text: str) -> Set[str]:
+            return set().union(*(found for _, found in automaton.iter(text)))
+        return match
+    
+    # One alternation per symbol, so a word that overlaps or prefixes another
+    # symbol's word (e.g. 'app' and 'apple') can't hide that symbol
+    symbol_words: Dict[str, List[str]] = {}
+    for word, word_symbols in words.items():
+        for symbol in word_symbols:
+            symbol_words.setdefault(symbol, []).append(word)
+    patterns = {
+        symbol: re.compile('|'.join(map(re.escape, sorted(word_list, key=len, reverse=True))))
+        for symbol, word_list in symbol_words.items()
+    }
+    
+    def match(text: str) -> Set[str]:
+        return {symbol for symbol, pattern in patterns.items() if pattern.search(text)}
+    return match
+
 
 class NewsSentimentAnalyzer:
     """News sentiment analysis for trading decisions"""
     
+    # Company name variations (basic implementation)
+    # This could be enhanced with a company name to symbol mapping
+    # Read-only: compiled symbol matchers are cached on the assumption it never changes
+    SYMBOL_PATTERNS: ClassVar[Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+        'AAPL': ('apple', 'iphone', 'ipad', 'macbook'),
+        'MSFT': ('microsoft', 'azure', 'office', 'windows'),
+        'GOOGL': ('google', 'alphabet', 'youtube', 'android'),
+        'AMZN': ('amazon', 'aws', 'prime'),
+        'TSLA': ('tesla', 'elon musk', 'electric vehicle'),
+        'META': ('facebook', 'meta', 'instagram', 'whatsapp'),
+        'NVDA': ('nvidia', 'gpu', 'ai chip'),
+        'SPY': ('spy', 'spdr', 's&p 500', 'sp500'),
+        'QQQ': ('qqq', 'nasdaq', 'invesco'),
+        'IWM': ('iwm', 'russell 2000', 'small cap')
+    })
+    
     def __init__(self):
         self.analyzer = SentimentIntensityAnalyzer()
         self.news_sources = [
@@ -25,6 +119,23 @@ class NewsSentimentAnalyzer:
             "https://feeds.reuters.com/news/wealth",
             "https://feeds.finance.yahoo.com/rss/2.0/headline?s=^GSPC&region=US&lang=en-US"
         ]
+        # blake2b digest of scored text -> VADER scores, bounded LRU
+        self._sentiment_cache: "OrderedDict[bytes, Dict[str, float]]" = OrderedDict()
+        self._sentiment_cache_size = 2048
+        self._sentiment_cache_lock = threading.Lock()
+        # frozenset of news ids -> sentiment of their combined text, bounded LRU
+        # (shares the lock above)
+        self._news_sentiment_cache: "OrderedDict[frozenset, Dict[str, Any]]" = OrderedDict()
+        # hours_back -> (monotonic fetch time, unfiltered news items), at most
+        # _news_cache_size windows; shared by the per-symbol and market sentiment paths
+        self._news_cache: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._news_ttl = 60.0
+        self._news_cache_size = 8
+        # Shared across fetches so keep-alive connections (and TLS sessions) survive between cycles
+        self._client: Optional[httpx.AsyncClient] = None
+        # source url -> validators and parsed items of its last 200 response, so an
+        # unchanged feed (304) is neither downloaded nor re-parsed
+        self._feed_cache: Dict[str, Dict[str, Any]] = {}
         
     async def fetch_news(self, symbols: List[str] = None, hours_back: int = 24) -> List[Dict[str, Any]]:
         """
@@ -37,64 +148,229 @@ class NewsSentimentAnalyzer:
         Returns:
             List of news items
         """
+        news_items = await self._fetch_recent_news(hours_back)
+        if not symbols:
+            return news_items
+        
+        # Symbol matching is CPU work over every item; keep it off the event loop
+        return await asyncio.to_thread(self._filter_by_symbols, news_items, symbols)
+    
+    async def _fetch_recent_news(self, hours_back: int) -> List[Dict[str, Any]]:
+        """All news from the last `hours_back` hours, reused for up to `_news_ttl` seconds"""
+        cached = self._news_cache.get(hours_back)
+        if cached is not None and time.monotonic() - cached[0] < self._news_ttl:
+            return cached[1]
+        
         news_items = []
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for source_url in self.news_sources:
-                try:
-                    response = await client.get(source_url)
-                    if response.status_code == 200:
-                        feed = feedparser.parse(response.content)
-                        
-                        for entry in feed.entries:
-                            try:
-                                # Parse publication date
-                                pub_date = None
-                                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                                    pub_date = datetime(*entry.published_parsed[:6])
-                                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                                    pub_date = datetime(*entry.updated_parsed[:6])
-                                
-                                if pub_date and pub_date < cutoff_time:
-                                    continue
-                                
-                                # Extract content
-                                title = entry.get('title', '')
-                                summary = entry.get('summary', '')
-                                link = entry.get('link', '')
-                                
-                                # Check if news is relevant to our symbols
-                                if symbols:
-                                    relevant_symbols = self._extract_symbols_from_text(
-                                        f"{title} {summary}", symbols
-                                    )
-                                    if not relevant_symbols:
-                                        continue
-                                else:
-                                    relevant_symbols = []
-                                
-                                news_item = {
-                                    'title': title,
-                                    'content': summary,
-                                    'url': link,
-                                    'published_at': pub_date or datetime.utcnow(),
-                                    'source': source_url,
-                                    'symbols': relevant_symbols
-                                }
-                                
-                                news_items.append(news_item)
-                                
-                            except Exception as e:
-                                logger.error(f"Error parsing news entry: {e}")
-                                continue
-                                
-                except Exception as e:
-                    logger.error(f"Error fetching news from {source_url}: {e}")
+        client = self._get_client()
+        # Fetch and parse every source concurrently; total latency is the slowest feed
+        results = await asyncio.gather(
+            *(
+                self._fetch_source(client, source_url, cutoff_time)
+                for source_url in self.news_sources
+            ),
+            return_exceptions=True
+        )
+        
+        for source_url, result in zip(self.news_sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching news from {source_url}: {result}")
+                continue
+            news_items.extend(result)
+        
+        # The same story is often syndicated to several feeds; keep its first copy
+        unique_items = {}
+        for item in news_items:
+            unique_items.setdefault(item['id'], item)
+        news_items = list(unique_items.values())
+        
+        # hours_back comes from the client, so drop expired windows on write and keep
+        # only the most recently fetched few
+        now = time.monotonic()
+        self._news_cache = {
+            window: entry for window, entry in self._news_cache.items()
+            if now - entry[0] < self._news_ttl and window != hours_back
+        }
+        self._news_cache[hours_back] = (now, news_items)
+        while len(self._news_cache) > self._news_cache_size:
+            del self._news_cache[next(iter(self._news_cache))]
+        return news_items
+    
+    def _filter_by_symbols(
+        self,
+        news_items: List[Dict[str, Any]],
+        symbols: List[str]
+    ) -> List[Dict[str, Any]]:
+        """News items that mention any of `symbols`, tagged with the symbols they mention"""
+        # Resolve the matcher once; each item then costs a single scan, and items
+        # with no hit are skipped before any per-symbol work
+        match = _symbol_matcher(frozenset(symbols))
+        relevant_items = []
+        for item in news_items:
+            matched = match(f"{item['title']} {item['content']}".lower())
+            if not matched:
+                continue
+            relevant_items.append({
+                **item,
+                'symbols': [symbol for symbol in symbols if symbol in matched]
+            })
+        return relevant_items
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _fetch_source(
+        self,
+        client: httpx.AsyncClient,
+        source_url: str,
+        cutoff_time: datetime
+    ) -> List[Dict[str, Any]]:
+        """Fetch one RSS source and parse it on a worker thread"""
+        # Revalidate only when the cached items cover the requested window
+        cached = self._feed_cache.get(source_url)
+        headers = {}
+        if cached is not None and cached['cutoff_time'] <= cutoff_time:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        # Stream the body into a single buffer rather than holding response.content
+        # alongside its decoded copies
+        body = io.BytesIO()
+        async with client.stream("GET", source_url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                return [item for item in cached['items'] if item['published_at'] >= cutoff_time]
+            if response.status_code != 200:
+                return []
+            etag = response.headers.get('etag')
+            # Lets feedparser try the server-declared charset first instead of guessing
+            content_type = response.headers.get('content-type')
+            response_headers = {'content-type': content_type} if content_type else None
+            last_modified = response.headers.get('last-modified')
+            async for chunk in response.aiter_bytes(65536):
+                body.write(chunk)
+        body.seek(0)
+        
+        # feedparser is blocking CPU work; keep it off the event loop
+        news_items = await asyncio.to_thread(
+            self._parse_feed, body, source_url, cutoff_time, response_headers
+        )
+        if etag or last_modified:
+            self._feed_cache[source_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'cutoff_time': cutoff_time,
+                'items': news_items
+            }
+        return news_items
+    
+    def _parse_feed(
+        self,
+        content: IO[bytes],
+        source_url: str,
+        cutoff_time: datetime,
+        response_headers: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse an RSS document into news items
+        
+        Args:
+            content: Feed body as a binary stream
+            source_url: Feed the body came from
+            cutoff_time: Entries published before this are skipped
+            response_headers: HTTP headers the body was served with
+            
+        Returns:
+            List of news items
+        """
+        news_items = []
+        feed = feedparser.parse(content, response_headers=response_headers)
+        
+        # One guard for the whole feed; a malformed entry ends this feed's parse and
+        # keeps the entries read so far
+        try:
+            # Feeds normally list entries newest first; when this one does, every entry
+            # after the first stale one is stale too
+            dates = [self._entry_date(entry) for entry in feed.entries[:2]]
+            newest_first = len(dates) == 2 and None not in dates and dates[0] >= dates[1]
+            
+            for entry in feed.entries:
+                # Parse publication date
+                pub_date = self._entry_date(entry)
+                
+                if pub_date and pub_date < cutoff_time:
+                    if newest_first:
+                        break
                     continue
+                
+                # Extract content
+                title = entry.get('title', '')
+                summary = entry.get('summary', '')
+                link = entry.get('link', '')
+                
+                news_items.append({
+                    'id': self._news_id(entry, title, summary, link),
+                    'title': title,
+                    'content': summary,
+                    'url': link,
+                    'published_at': pub_date or datetime.now(timezone.utc),
+                    'source': source_url,
+                    'symbols': []
+                })
+                
+        except Exception as e:
+            logger.error(f"Error parsing news from {source_url}: {e}")
         
         return news_items
     
+    @staticmethod
+    def _news_id(entry: Any, title: str, summary: str, link: str) -> str:
+        """
+        Stable id for a feed entry, used to dedupe syndicated copies
+        
+        Keyed on the link, or on title, summary and publication date when there is
+        none. Entries with none of those get a random id so they are never merged.
+        """
+        key = link or '\n'.join((title, summary, entry.get('published', '')))
+        if not key.strip():
+            return uuid.uuid4().hex
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    
+    @staticmethod
+    def _entry_date(entry: Any) -> Optional[datetime]:
+        """Publication (or last update) time of a feed entry in UTC, if it has one"""
+        # feedparser's parsed struct_time is already UTC and is the cheap path
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            return datetime(*parsed[:6], tzinfo=timezone.utc)
+        
+        # Fall back to the raw date string for formats feedparser could not read
+        raw_date = entry.get('published') or entry.get('updated')
+        if not raw_date:
+            return None
+        try:
+            pub_date = du_parser.parse(raw_date, tzinfos=TZINFOS)
+        except (ValueError, OverflowError):
+            return None
+        if pub_date.tzinfo is None:
+            return pub_date.replace(tzinfo=timezone.utc)
+        return pub_date.astimezone(timezone.utc)
+    
     def _extract_symbols_from_text(self, text: str, symbols: List[str]) -> List[str]:
         """
         Extract relevant symbols from news text
@@ -106,37 +382,10 @@ class NewsSentimentAnalyzer:
         Returns:
             List of symbols found in the text
         """
-        found_symbols = []
-        text_lower = text.lower()
+        # One pass over the text matches every symbol and company-name pattern at once
+        matched = _symbol_matcher(frozenset(symbols))(text.lower())
         
-        for symbol in symbols:
-            symbol_lower = symbol.lower()
-            
-            # Check for exact symbol match
-            if symbol_lower in text_lower:
-                found_symbols.append(symbol)
-                continue
-            
-            # Check for company name variations (basic implementation)
-            # This could be enhanced with a company name to symbol mapping
-            symbol_patterns = {
-                'AAPL': ['apple', 'iphone', 'ipad', 'macbook'],
-                'MSFT': ['microsoft', 'azure', 'office', 'windows'],
-                'GOOGL': ['google', 'alphabet', 'youtube', 'android'],
-                'AMZN': ['amazon', 'aws', 'prime'],
-                'TSLA': ['tesla', 'elon musk', 'electric vehicle'],
-                'META': ['facebook', 'meta', 'instagram', 'whatsapp'],
-                'NVDA': ['nvidia', 'gpu', 'ai chip'],
-                'SPY': ['spy', 'spdr', 's&p 500', 'sp500'],
-                'QQQ': ['qqq', 'nasdaq', 'invesco'],
-                'IWM': ['iwm', 'russell 2000', 'small cap']
-            }
-            
-            if symbol in symbol_patterns:
-                for pattern in symbol_patterns[symbol]:
-                    if pattern in text_lower:
-                        found_symbols.append(symbol)
-                        break
+        found_symbols = [symbol for symbol in symbols if symbol in matched]
         
         return found_symbols
     
@@ -151,7 +400,7 @@ class NewsSentimentAnalyzer:
             Sentiment analysis results
         """
         try:
-            scores = self.analyzer.polarity_scores(text)
+            scores = self._polarity_scores(text)
             
             # Determine sentiment label
             if scores['compound'] >= 0.05:
@@ -179,6 +428,43 @@ class NewsSentimentAnalyzer:
                 'label': 'neutral'
             }
     
+    def _polarity_scores(self, text: str) -> Dict[str, float]:
+        """VADER polarity scores, memoized on a digest of the text"""
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._sentiment_cache_lock:
+            scores = self._sentiment_cache.get(key)
+            if scores is not None:
+                self._sentiment_cache.move_to_end(key)
+                return scores
+        
+        scores = self.analyzer.polarity_scores(_EMOTICON_RUN.sub(r'\1\1\1', text))
+        
+        with self._sentiment_cache_lock:
+            self._sentiment_cache[key] = scores
+            if len(self._sentiment_cache) > self._sentiment_cache_size:
+                self._sentiment_cache.popitem(last=False)
+        return scores
+    
+    def _score_news(self, news_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sentiment of the combined text of news items, memoized on the set of item ids"""
+        key = frozenset(item['id'] for item in news_items)
+        with self._sentiment_cache_lock:
+            sentiment = self._news_sentiment_cache.get(key)
+            if sentiment is not None:
+                self._news_sentiment_cache.move_to_end(key)
+                return sentiment
+        
+        combined_text = ' '.join(
+            item['title'] + ' ' + (item.get('content') or '') for item in news_items
+        )
+        sentiment = self.analyze_sentiment(combined_text)
+        
+        with self._sentiment_cache_lock:
+            self._news_sentiment_cache[key] = sentiment
+            if len(self._news_sentiment_cache) > self._sentiment_cache_size:
+                self._news_sentiment_cache.popitem(last=False)
+        return sentiment
+    
     async def get_sentiment_for_symbols(
         self,
         symbols: List[str],
@@ -206,6 +492,13 @@ class NewsSentimentAnalyzer:
                     if symbol in symbol_news:
                         symbol_news[symbol].append(item)
             
+            # Score every symbol with news concurrently on worker threads
+            scored = [symbol for symbol, news_list in symbol_news.items() if news_list]
+            scores = await asyncio.gather(
+                *(asyncio.to_thread(self._score_news, symbol_news[symbol]) for symbol in scored)
+            )
+            sentiments = dict(zip(scored, scores))
+            
             # Analyze sentiment for each symbol
             symbol_sentiment = {}
             
@@ -219,14 +512,7 @@ class NewsSentimentAnalyzer:
                     }
                     continue
                 
-                # Combine all news text for this symbol
-                combined_text = ' '.join([
-                    f"{item['title']} {item.get('content', '')}"
-                    for item in news_list
-                ])
-                
-                # Analyze sentiment
-                sentiment = self.analyze_sentiment(combined_text)
+                sentiment = sentiments[symbol]
                 
                 # Calculate confidence based on news count and sentiment strength
                 confidence = min(len(news_list) / 5.0, 1.0) * abs(sentiment['compound'])
@@ -306,14 +592,8 @@ class NewsSentimentAnalyzer:
                     'confidence': 0.0
                 }
             
-            # Combine all news text
-            combined_text = ' '.join([
-                f"{item['title']} {item.get('content', '')}"
-                for item in news_items
-            ])
-            
-            # Analyze sentiment
-            sentiment = self.analyze_sentiment(combined_text)
+            # Analyze sentiment of all news text combined
+            sentiment = await asyncio.to_thread(self._score_news, news_items)
             
             # Calculate confidence
             confidence = min(len(news_items) / 10.0, 1.0) * abs(sentiment['compound'])
@@ -333,3 +613,93 @@ class NewsSentimentAnalyzer:
                 'news_count': 0,
                 'confidence': 0.0
             }
+
+
+class SentimentBatcher:
+    """Coalesce concurrent per-symbol sentiment lookups into batched analyzer calls"""
+    
+    def __init__(
+        self,
+        analyzer: NewsSentimentAnalyzer,
+        max_wait: float = 0.05,
+        max_batch: int = 32
+    ):
+        self.analyzer = analyzer
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+    
+    def start(self):
+        """Start the background batching task on the running event loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop batching and wait for in-flight batches to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+    
+    async def submit(self, symbol: str, hours_back: int = 24) -> Dict[str, Any]:
+        """
+        Get sentiment for one symbol, batched with other concurrent requests
+        
+        Args:
+            symbol: Symbol to analyze
+            hours_back: How many hours back to fetch news
+            
+        Returns:
+            Sentiment data for the symbol
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((symbol, hours_back, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Flush concurrently so the next batch can start collecting immediately
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+    
+    async def _flush(self, batch: List[Tuple[str, int, asyncio.Future]]):
+        by_window: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        for symbol, hours_back, future in batch:
+            by_window.setdefault(hours_back, []).append((symbol, future))
+        
+        for hours_back, requests in by_window.items():
+            symbols = list(dict.fromkeys(symbol for symbol, _ in requests))
+            try:
+                results = await self.analyzer.get_sentiment_for_symbols(symbols, hours_back)
+            except Exception as e:
+                logger.error(f"Error in batched sentiment lookup: {e}")
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for symbol, future in requests:
+                if not future.done():
+                    future.set_result(results.get(symbol, {}))
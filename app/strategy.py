@@ -3,13 +3,24 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import logging
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
 
 from app.models import StrategyConfig, OrderSide, OrderType, AutomationMode
+from app.cache import ttl_for_timeframe
 from app.indicators import TechnicalIndicators
 from app.alpaca_client import AlpacaClient
 
 logger = logging.getLogger(__name__)
 
+# Columns a signal is built from, read off the bar it fired on
+_SIGNAL_COLUMNS = ('stoch_k', 'stoch_d', 'cci', 'rsi', 'close', 'volume')
+
+# Marks a decision-cache miss, since None is a valid cached result
+_MISS = object()
+
 
 class TradingSignal:
     """Represents a trading signal"""
@@ -37,6 +48,8 @@ class TradingSignal:
         self.indicators = indicators or {}
         self.notes = notes
         self.timestamp = datetime.utcnow()
+        # Stable handle for confirming/rejecting the signal through the API
+        self.id = uuid.uuid4().hex
 
 
 class StochasticCCIStrategy:
@@ -46,7 +59,23 @@ class StochasticCCIStrategy:
         self.config = config
         self.alpaca_client = alpaca_client
         self.indicators = TechnicalIndicators()
+        # signal_cache_key() -> signal (or None) from the last analysis of that bar, bounded LRU
+        self._signal_cache: "OrderedDict[Tuple[Any, ...], Optional[TradingSignal]]" = OrderedDict()
+        self._signal_cache_size = 256
         
+    @property
+    def indicator_params(self) -> Dict[str, int]:
+        """Indicator settings this strategy passes to calculate_all_indicators"""
+        return {
+            'stoch_k_period': self.config.stoch_k_period,
+            'stoch_d_period': self.config.stoch_d_period,
+            'cci_period': self.config.cci_period
+        }
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Calculate the indicators this strategy needs on OHLCV data"""
+        return self.indicators.calculate_all_indicators(data, **self.indicator_params)
+    
     def analyze_symbol(
         self,
         symbol: str,
@@ -65,152 +94,206 @@ class StochasticCCIStrategy:
             TradingSignal if conditions are met, None otherwise
         """
         try:
-            if len(data) < max(self.config.stoch_k_period, self.config.cci_period) + 10:
+            if not self._has_enough_data(data):
                 return None
-                
-            # Calculate indicators
-            df_with_indicators = self.indicators.calculate_all_indicators(
-                data,
-                stoch_k_period=self.config.stoch_k_period,
-                stoch_d_period=self.config.stoch_d_period,
-                cci_period=self.config.cci_period
-            )
             
-            # Get latest values
-            latest = df_with_indicators.iloc[-1]
-            prev = df_with_indicators.iloc[-2] if len(df_with_indicators) > 1 else latest
-            
-            # Check for buy signals
-            buy_signal = self._check_buy_conditions(latest, prev)
-            if buy_signal:
-                return TradingSignal(
-                    symbol=symbol,
-                    side=OrderSide.BUY,
-                    confidence=buy_signal['confidence'],
-                    price=latest['close'],
-                    stop_loss=buy_signal.get('stop_loss'),
-                    take_profit=buy_signal.get('take_profit'),
-                    timeframe=timeframe,
-                    strategy_name=self.config.name,
-                    indicators={
-                        'stoch_k': latest['stoch_k'],
-                        'stoch_d': latest['stoch_d'],
-                        'cci': latest['cci'],
-                        'rsi': latest.get('rsi'),
-                        'close': latest['close']
-                    },
-                    notes=buy_signal.get('notes')
-                )
-            
-            # Check for sell signals
-            sell_signal = self._check_sell_conditions(latest, prev)
-            if sell_signal:
-                return TradingSignal(
-                    symbol=symbol,
-                    side=OrderSide.SELL,
-                    confidence=sell_signal['confidence'],
-                    price=latest['close'],
-                    stop_loss=sell_signal.get('stop_loss'),
-                    take_profit=sell_signal.get('take_profit'),
-                    timeframe=timeframe,
-                    strategy_name=self.config.name,
-                    indicators={
-                        'stoch_k': latest['stoch_k'],
-                        'stoch_d': latest['stoch_d'],
-                        'cci': latest['cci'],
-                        'rsi': latest.get('rsi'),
-                        'close': latest['close']
-                    },
-                    notes=sell_signal.get('notes')
-                )
-                
-            return None
+            # Same latest bar as a previous call: reuse its decision, but
+            # emit a fresh signal so callers never see the same object twice
+            key = self.signal_cache_key(symbol, timeframe, data)
+            decision = self.cached_decision(key)
+            if decision is _MISS:
+                decision = self.signal_decision(symbol, self.calculate_indicators(data), timeframe)
+                self.cache_decision(key, decision)
+            return self.build_signal(decision)
             
         except Exception as e:
             logger.error(f"Error analyzing {symbol}: {e}")
             return None
     
-    def _check_buy_conditions(self, latest: pd.Series, prev: pd.Series) -> Optional[Dict[str, Any]]:
-        """Check for buy signal conditions"""
-        try:
-            # Stochastic oversold conditions
-            stoch_oversold = (
-                latest['stoch_k'] < self.config.stoch_oversold and
-                latest['stoch_d'] < self.config.stoch_oversold and
-                latest['stoch_k'] > latest['stoch_d']  # K crossing above D
-            )
-            
-            # CCI oversold conditions
-            cci_oversold = latest['cci'] < self.config.cci_oversold
-            
-            # RSI not extremely oversold (avoid falling knife)
-            rsi_ok = latest.get('rsi', 50) > 25
-            
-            # Volume confirmation (if available)
-            volume_ok = True
-            if 'volume' in latest and 'volume' in prev:
-                volume_ok = latest['volume'] > prev['volume'] * 0.8
-            
-            if stoch_oversold and cci_oversold and rsi_ok and volume_ok:
-                confidence = 0.7
-                
-                # Calculate stop loss and take profit
-                stop_loss = latest['close'] * (1 - self.config.stop_loss_percent / 100)
-                take_profit = latest['close'] * (1 + (self.config.stop_loss_percent * 2) / 100)
-                
-                return {
-                    'confidence': confidence,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'notes': f"Stochastic oversold ({latest['stoch_k']:.1f}), CCI oversold ({latest['cci']:.1f})"
-                }
-                
-            return None
+    @staticmethod
+    def signal_cache_key(symbol: str, timeframe: str, data: pd.DataFrame) -> Tuple[Any, ...]:
+        """
+        Identify the bar a signal decision was computed on
+        
+        The last close is part of the key so an in-progress bar that is still
+        updating is re-analyzed.
+        """
+        return (symbol, timeframe, data.index[-1], float(data['close'].iat[-1]), len(data))
+    
+    def cached_decision(self, key: Tuple[Any, ...]) -> Any:
+        """Cached decision for key, or _MISS"""
+        decision = self._signal_cache.get(key, _MISS)
+        if decision is not _MISS:
+            self._signal_cache.move_to_end(key)
+        return decision
+    
+    def cache_decision(self, key: Tuple[Any, ...], decision: Optional[Dict[str, Any]]):
+        self._signal_cache[key] = decision
+        self._signal_cache.move_to_end(key)
+        if len(self._signal_cache) > self._signal_cache_size:
+            self._signal_cache.popitem(last=False)
+    
+    def analyze_indicators(
+        self,
+        symbol: str,
+        df_with_indicators: pd.DataFrame,
+        timeframe: str,
+        lookback: int = 1
+    ) -> Optional[TradingSignal]:
+        """
+        Generate a trading signal from data that already carries indicator columns
+        
+        Args:
+            symbol: Stock symbol
+            df_with_indicators: Output of calculate_indicators()
+            timeframe: Timeframe of the data
+            lookback: Number of most recent bars a signal may have fired on
             
-        except Exception as e:
-            logger.error(f"Error checking buy conditions: {e}")
+        Returns:
+            TradingSignal for the most recent bar that meets the conditions, None otherwise
+        """
+        return self.build_signal(
+            self.signal_decision(symbol, df_with_indicators, timeframe, lookback)
+        )
+    
+    @staticmethod
+    def build_signal(decision: Optional[Dict[str, Any]]) -> Optional[TradingSignal]:
+        """Create a new TradingSignal from a decision returned by signal_decision()"""
+        if decision is None:
             return None
+        return TradingSignal(**{**decision, 'indicators': dict(decision['indicators'])})
     
-    def _check_sell_conditions(self, latest: pd.Series, prev: pd.Series) -> Optional[Dict[str, Any]]:
-        """Check for sell signal conditions"""
+    def signal_decision(
+        self,
+        symbol: str,
+        df_with_indicators: pd.DataFrame,
+        timeframe: str,
+        lookback: int = 1
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a signal fires, without creating the TradingSignal
+        
+        Decisions are what gets cached: each pass builds its own signal from
+        one so repeated passes over the same bar never share a signal id or
+        timestamp.
+        
+        Returns:
+            TradingSignal keyword arguments, or None if no signal fires
+        """
         try:
-            # Stochastic overbought conditions
-            stoch_overbought = (
-                latest['stoch_k'] > self.config.stoch_overbought and
-                latest['stoch_d'] > self.config.stoch_overbought and
-                latest['stoch_k'] < latest['stoch_d']  # K crossing below D
-            )
+            if not self._has_enough_data(df_with_indicators):
+                return None
             
-            # CCI overbought conditions
-            cci_overbought = latest['cci'] > self.config.cci_overbought
+            buy_mask, sell_mask = self.signal_masks(df_with_indicators)
+            start = max(len(df_with_indicators) - lookback, 0)
+            fired = np.flatnonzero((buy_mask | sell_mask)[start:])
+            if fired.size == 0:
+                return None
+            bar = start + fired[-1]
             
-            # RSI not extremely overbought
-            rsi_ok = latest.get('rsi', 50) < 75
+            # Read the signal bar as plain floats instead of per-label Series lookups
+            columns = [column for column in _SIGNAL_COLUMNS if column in df_with_indicators.columns]
+            row = df_with_indicators.iloc[[bar]][columns].to_numpy(dtype=float)[0]
+            latest = dict(zip(columns, row.tolist()))
             
-            # Volume confirmation
-            volume_ok = True
-            if 'volume' in latest and 'volume' in prev:
-                volume_ok = latest['volume'] > prev['volume'] * 0.8
+            if buy_mask[bar]:
+                side = OrderSide.BUY
+                details = self._buy_signal_details(latest)
+            else:
+                side = OrderSide.SELL
+                details = self._sell_signal_details(latest)
             
-            if stoch_overbought and cci_overbought and rsi_ok and volume_ok:
-                confidence = 0.7
-                
-                # Calculate stop loss and take profit
-                stop_loss = latest['close'] * (1 + self.config.stop_loss_percent / 100)
-                take_profit = latest['close'] * (1 - (self.config.stop_loss_percent * 2) / 100)
-                
-                return {
-                    'confidence': confidence,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'notes': f"Stochastic overbought ({latest['stoch_k']:.1f}), CCI overbought ({latest['cci']:.1f})"
-                }
-                
-            return None
+            return {
+                'symbol': symbol,
+                'side': side,
+                'confidence': details['confidence'],
+                'price': latest['close'],
+                'stop_loss': details.get('stop_loss'),
+                'take_profit': details.get('take_profit'),
+                'timeframe': timeframe,
+                'strategy_name': self.config.name,
+                'indicators': {
+                    'stoch_k': latest['stoch_k'],
+                    'stoch_d': latest['stoch_d'],
+                    'cci': latest['cci'],
+                    'rsi': latest.get('rsi'),
+                    'close': latest['close']
+                },
+                'notes': details.get('notes')
+            }
             
         except Exception as e:
-            logger.error(f"Error checking sell conditions: {e}")
+            logger.error(f"Error analyzing {symbol}: {e}")
             return None
+    
+    def _has_enough_data(self, data: pd.DataFrame) -> bool:
+        return len(data) >= max(self.config.stoch_k_period, self.config.cci_period) + 10
+    
+    def signal_masks(self, df_with_indicators: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the buy and sell conditions on every bar in one vectorized pass
+        
+        Args:
+            df_with_indicators: Output of calculate_indicators()
+            
+        Returns:
+            Tuple of (buy_mask, sell_mask) boolean arrays aligned with the rows
+        """
+        df = df_with_indicators
+        stoch_k = df['stoch_k'].to_numpy(dtype=float)
+        stoch_d = df['stoch_d'].to_numpy(dtype=float)
+        cci = df['cci'].to_numpy(dtype=float)
+        rsi = df['rsi'].to_numpy(dtype=float) if 'rsi' in df.columns else np.full(len(df), 50.0)
+        
+        # Volume confirmation (if available); the first bar compares against itself
+        if 'volume' in df.columns:
+            volume = df['volume'].to_numpy(dtype=float)
+            prev_volume = np.concatenate((volume[:1], volume[:-1]))
+            volume_ok = volume > prev_volume * 0.8
+        else:
+            volume_ok = np.ones(len(df), dtype=bool)
+        
+        # Stochastic oversold with K crossing above D, CCI oversold, and RSI not
+        # extremely oversold (avoid falling knife)
+        buy_mask = (
+            (stoch_k < self.config.stoch_oversold) &
+            (stoch_d < self.config.stoch_oversold) &
+            (stoch_k > stoch_d) &
+            (cci < self.config.cci_oversold) &
+            (rsi > 25) &
+            volume_ok
+        )
+        
+        # Stochastic overbought with K crossing below D, CCI overbought, and RSI not
+        # extremely overbought
+        sell_mask = (
+            (stoch_k > self.config.stoch_overbought) &
+            (stoch_d > self.config.stoch_overbought) &
+            (stoch_k < stoch_d) &
+            (cci > self.config.cci_overbought) &
+            (rsi < 75) &
+            volume_ok
+        )
+        
+        return buy_mask, sell_mask
+    
+    def _buy_signal_details(self, latest: Dict[str, float]) -> Dict[str, Any]:
+        """Confidence, stop loss and take profit for a buy on the given bar"""
+        return {
+            'confidence': 0.7,
+            'stop_loss': latest['close'] * (1 - self.config.stop_loss_percent / 100),
+            'take_profit': latest['close'] * (1 + (self.config.stop_loss_percent * 2) / 100),
+            'notes': f"Stochastic oversold ({latest['stoch_k']:.1f}), CCI oversold ({latest['cci']:.1f})"
+        }
+    
+    def _sell_signal_details(self, latest: Dict[str, float]) -> Dict[str, Any]:
+        """Confidence, stop loss and take profit for a sell on the given bar"""
+        return {
+            'confidence': 0.7,
+            'stop_loss': latest['close'] * (1 + self.config.stop_loss_percent / 100),
+            'take_profit': latest['close'] * (1 - (self.config.stop_loss_percent * 2) / 100),
+            'notes': f"Stochastic overbought ({latest['stoch_k']:.1f}), CCI overbought ({latest['cci']:.1f})"
+        }
 
 
 class RiskManager:
@@ -259,7 +342,9 @@ class RiskManager:
         symbol: str,
         side: OrderSide,
         quantity: int,
-        price: float
+        price: float,
+        positions: Optional[List[Dict[str, Any]]] = None,
+        account_info: Optional[Any] = None
     ) -> Tuple[bool, str]:
         """
         Check if trade meets risk management criteria
@@ -269,13 +354,23 @@ class RiskManager:
             side: Buy or sell
             quantity: Number of shares
             price: Price per share
+            positions: Current positions, fetched if not given
+            account_info: Account information, fetched if not given
             
         Returns:
             Tuple of (is_allowed, reason)
         """
         try:
-            # Get current positions
-            positions = await self.alpaca_client.get_positions()
+            # Get current positions and account information, concurrently if both are missing
+            if positions is None and account_info is None:
+                positions, account_info = await asyncio.gather(
+                    self.alpaca_client.get_positions(),
+                    self.alpaca_client.get_account_info()
+                )
+            elif positions is None:
+                positions = await self.alpaca_client.get_positions()
+            elif account_info is None:
+                account_info = await self.alpaca_client.get_account_info()
             
             # Check maximum positions limit
             if len(positions) >= self.config.max_positions:
@@ -288,7 +383,6 @@ class RiskManager:
             
             # Check position size
             position_value = quantity * price
-            account_info = await self.alpaca_client.get_account_info()
             
             if position_value > account_info.buying_power:
                 return False, "Insufficient buying power"
@@ -307,6 +401,11 @@ class StrategyEngine:
         self.alpaca_client = alpaca_client
         self.strategies: Dict[str, StochasticCCIStrategy] = {}
         self.risk_managers: Dict[str, RiskManager] = {}
+        # (symbol, timeframe, indicator params) -> (monotonic time computed, enriched bars),
+        # warmed by every analyze_symbols pass so API reads skip the indicator work; at
+        # most indicator_cache_size entries, none older than their timeframe's TTL
+        self.indicator_cache: Dict[Tuple[str, str, Tuple[Tuple[str, int], ...]], Tuple[float, pd.DataFrame]] = {}
+        self.indicator_cache_size = 128
     
     def add_strategy(self, config: StrategyConfig):
         """Add a trading strategy"""
@@ -323,6 +422,99 @@ class StrategyEngine:
         if strategy_name in self.risk_managers:
             del self.risk_managers[strategy_name]
     
+    def active_strategy_groups(self) -> Dict[Tuple[Tuple[str, int], ...], List[StochasticCCIStrategy]]:
+        """Active strategies grouped by indicator settings, so each group shares one indicator pass"""
+        groups: Dict[Tuple[Tuple[str, int], ...], List[StochasticCCIStrategy]] = {}
+        # Snapshot, so a strategy added or removed mid-loop can't break the iteration
+        for strategy in list(self.strategies.values()):
+            if strategy.config.is_active:
+                params = tuple(sorted(strategy.indicator_params.items()))
+                groups.setdefault(params, []).append(strategy)
+        return groups
+    
+    def cached_indicators(
+        self,
+        symbol: str,
+        timeframe: str,
+        params: Tuple[Tuple[str, int], ...],
+        max_age: float
+    ) -> Optional[pd.DataFrame]:
+        """Enriched bars from the last analysis pass, if computed within `max_age` seconds"""
+        hit = self.indicator_cache.get((symbol, timeframe, params))
+        if hit is None or time.monotonic() - hit[0] > max_age:
+            return None
+        return hit[1]
+    
+    def _store_indicators(
+        self,
+        cache_key: Tuple[str, str, Tuple[Tuple[str, int], ...]],
+        enriched: pd.DataFrame
+    ):
+        """Cache enriched bars, dropping expired entries and the oldest beyond the size cap"""
+        # Without this, dropped symbols, deleted strategies' parameter sets and every
+        # timeframe ever analyzed would each keep a full enriched frame alive
+        now = time.monotonic()
+        self.indicator_cache = {
+            key: entry for key, entry in list(self.indicator_cache.items())
+            if now - entry[0] <= ttl_for_timeframe(key[1]) and key != cache_key
+        }
+        self.indicator_cache[cache_key] = (now, enriched)
+        while len(self.indicator_cache) > self.indicator_cache_size:
+            del self.indicator_cache[next(iter(self.indicator_cache))]
+    
+    def analyze_data(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        timeframe: str,
+        groups: Optional[Dict[Tuple[Tuple[str, int], ...], List[StochasticCCIStrategy]]] = None
+    ) -> List[TradingSignal]:
+        """
+        Run every active strategy over one symbol's OHLCV data
+        
+        Args:
+            symbol: Stock symbol
+            data: OHLCV data
+            timeframe: Timeframe of the data
+            groups: Output of active_strategy_groups(); taken on the event loop by
+                analyze_symbols so this can run on a worker thread
+            
+        Returns:
+            List of trading signals
+        """
+        if groups is None:
+            groups = self.active_strategy_groups()
+        
+        signals = []
+        key = StochasticCCIStrategy.signal_cache_key(symbol, timeframe, data)
+        for params, strategies in groups.items():
+            cache_key = (symbol, timeframe, params)
+            decisions = [strategy.cached_decision(key) for strategy in strategies]
+            
+            # Decisions can be cached without a matching frame (analyze_symbol never
+            # writes one, and the LRU may hold a bar the feed has come back to), so the
+            # cached frame only counts as current if it was computed on this bar
+            hit = self.indicator_cache.get(cache_key)
+            frame_current = (
+                hit is not None
+                and StochasticCCIStrategy.signal_cache_key(symbol, timeframe, hit[1]) == key
+            )
+            
+            if _MISS in decisions or not frame_current:
+                enriched = strategies[0].calculate_indicators(data)
+                self._store_indicators(cache_key, enriched)
+                decisions = [strategy.signal_decision(symbol, enriched, timeframe) for strategy in strategies]
+                for strategy, decision in zip(strategies, decisions):
+                    strategy.cache_decision(key, decision)
+            else:
+                # Bars are unchanged since the last pass, so its indicators are still current
+                self._store_indicators(cache_key, hit[1])
+            
+            signals.extend(
+                StochasticCCIStrategy.build_signal(decision) for decision in decisions if decision
+            )
+        return signals
+    
     async def analyze_symbols(
         self,
         symbols: List[str],
@@ -339,40 +531,50 @@ class StrategyEngine:
             List of trading signals
         """
         signals = []
+        pairs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
         
-        for symbol in symbols:
-            for timeframe in timeframes:
-                try:
-                    # Get historical data
-                    end_date = datetime.now()
-                    start_date = end_date - timedelta(days=365)  # Get 1 year of data
-                    
-                    data = await self.alpaca_client.get_historical_data(
-                        symbol, timeframe, start_date, end_date
-                    )
-                    
-                    if data.empty:
-                        continue
-                    
-                    # Analyze with each active strategy
-                    for strategy_name, strategy in self.strategies.items():
-                        if not strategy.config.is_active:
-                            continue
-                            
-                        signal = strategy.analyze_symbol(symbol, data, timeframe)
-                        if signal:
-                            signals.append(signal)
-                            
-                except Exception as e:
-                    logger.error(f"Error analyzing {symbol} on {timeframe}: {e}")
+        # Get historical data for every (symbol, timeframe) concurrently
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=365)  # Get 1 year of data
+        
+        results = await asyncio.gather(
+            *(
+                self.alpaca_client.get_historical_data(symbol, timeframe, start_date, end_date)
+                for symbol, timeframe in pairs
+            ),
+            return_exceptions=True
+        )
+        
+        # Group once, up front: the worker threads below then never iterate the live
+        # strategies dict while the strategy routes add or remove entries
+        groups = self.active_strategy_groups()
+        
+        for (symbol, timeframe), data in zip(pairs, results):
+            if isinstance(data, Exception):
+                logger.error(f"Error analyzing {symbol} on {timeframe}: {data}")
+                continue
+            
+            try:
+                if data.empty:
                     continue
+                
+                # Analyze with each active strategy, off the event loop
+                signals.extend(
+                    await asyncio.to_thread(self.analyze_data, symbol, data, timeframe, groups)
+                )
+                    
+            except Exception as e:
+                logger.error(f"Error analyzing {symbol} on {timeframe}: {e}")
+                continue
         
         return signals
     
     async def execute_signal(
         self,
         signal: TradingSignal,
-        automation_mode: AutomationMode = AutomationMode.ALERT_ONLY
+        automation_mode: AutomationMode = AutomationMode.ALERT_ONLY,
+        account_info: Optional[Any] = None,
+        positions: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Execute a trading signal based on automation mode
@@ -380,6 +582,9 @@ class StrategyEngine:
         Args:
             signal: Trading signal to execute
             automation_mode: Automation mode (auto, alert_only, semi_auto)
+            account_info: Account information, fetched if not given; callers executing
+                several signals can fetch it once
+            positions: Current positions, fetched if not given
             
         Returns:
             Execution result
@@ -397,8 +602,18 @@ class StrategyEngine:
             if not risk_manager:
                 return {"status": "error", "message": "Risk manager not found"}
             
+            # Fetch account information and positions together for sizing and risk checks
+            if account_info is None and positions is None:
+                account_info, positions = await asyncio.gather(
+                    self.alpaca_client.get_account_info(),
+                    self.alpaca_client.get_positions()
+                )
+            elif account_info is None:
+                account_info = await self.alpaca_client.get_account_info()
+            elif positions is None:
+                positions = await self.alpaca_client.get_positions()
+            
             # Calculate position size
-            account_info = await self.alpaca_client.get_account_info()
             quantity = await risk_manager.calculate_position_size(
                 signal.symbol, signal.price, account_info.equity
             )
@@ -408,7 +623,8 @@ class StrategyEngine:
             
             # Check risk limits
             is_allowed, reason = await risk_manager.check_risk_limits(
-                signal.symbol, signal.side, quantity, signal.price
+                signal.symbol, signal.side, quantity, signal.price,
+                positions=positions, account_info=account_info
             )
             
             if not is_allowed:
@@ -0,0 +1,14 @@
+#!/usr/bin/env bash
+# Production launcher: gunicorn process manager with one uvicorn event loop per worker.
+# Workers are forked without --preload, so each one imports the app and builds its own
+# Alpaca client, scheduler and sentiment analyzer.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+exec gunicorn app.main:app \
+    -k uvicorn.workers.UvicornWorker \
+    -w "${WORKERS:-$(( $(nproc) * 2 + 1 ))}" \
+    --bind "0.0.0.0:${PORT:-8000}" \
+    --max-requests 10000 \
+    --max-requests-jitter 1000
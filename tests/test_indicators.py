@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators import _BB_RESYNC, TechnicalIndicators
+
+
+# Baseline pandas formulas the vectorized indicators must keep matching
+
+def pandas_stochastic(high, low, close, k_period, d_period):
+    lowest_low = low.rolling(window=k_period).min()
+    highest_high = high.rolling(window=k_period).max()
+    k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    return k_percent, k_percent.rolling(window=d_period).mean()
+
+
+def pandas_cci(high, low, close, period):
+    typical_price = (high + low + close) / 3
+    sma_tp = typical_price.rolling(window=period).mean()
+    mean_deviation = typical_price.rolling(window=period).apply(
+        lambda x: np.mean(np.abs(x - x.mean()))
+    )
+    return (typical_price - sma_tp) / (0.015 * mean_deviation)
+
+
+def pandas_moving_average(close, period, ma_type):
+    if ma_type == "sma":
+        return close.rolling(window=period).mean()
+    if ma_type == "ema":
+        return close.ewm(span=period).mean()
+    weights = np.arange(1, period + 1)
+    return close.rolling(window=period).apply(
+        lambda x: np.dot(x, weights) / weights.sum(), raw=True
+    )
+
+
+def pandas_bollinger(close, period, std_dev):
+    middle_band = close.rolling(window=period).mean()
+    std = close.rolling(window=period).std()
+    return middle_band + std * std_dev, middle_band, middle_band - std * std_dev
+
+
+def pandas_macd(close, fast_period, slow_period, signal_period):
+    macd_line = close.ewm(span=fast_period).mean() - close.ewm(span=slow_period).mean()
+    signal_line = macd_line.ewm(span=signal_period).mean()
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def wilder_rsi(close, period):
+    """Wilder's RSI, seeded by the SMA of the first `period` changes; NaN changes are skipped"""
+    out = np.full(len(close), np.nan)
+    gains, losses = [], []
+    avg_gain = avg_loss = None
+    for i in range(1, len(close)):
+        delta = close[i] - close[i - 1]
+        if np.isnan(delta):
+            continue
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if avg_gain is None:
+            gains.append(gain)
+            losses.append(loss)
+            if len(gains) < period:
+                continue
+            avg_gain, avg_loss = sum(gains) / period, sum(losses) / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0:
+            out[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            out[i] = 100.0
+    return out
+
+
+def make_bars(n, nan_at=(), seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    for i in nan_at:
+        close[i] = high[i] = low[i] = np.nan
+    return pd.DataFrame(
+        {"open": close, "high": high, "low": low, "close": close, "volume": np.full(n, 1e6)},
+        index=pd.date_range("2024-01-01", periods=n, freq="min"),
+    )
+
+
+# NaN gaps include bars on either side of the Bollinger kernel's resync points
+BARS = {
+    "clean": make_bars(3000),
+    "nan_gaps": make_bars(
+        3000,
+        nan_at=(5, 40, 41, 300, _BB_RESYNC - 1, _BB_RESYNC, _BB_RESYNC + 3,
+                2 * _BB_RESYNC - 2, 2 * _BB_RESYNC + 1),
+    ),
+    "short": make_bars(8),
+}
+PERIODS = [1, 2, 5, 14, 20]
+
+
+def assert_series_close(actual, expected):
+    assert actual.index.equals(expected.index)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-7, atol=1e-8)
+
+
+@pytest.fixture(params=sorted(BARS))
+def bars(request):
+    return BARS[request.param]
+
+
+@pytest.mark.parametrize("k_period, d_period", [(1, 1), (1, 3), (14, 3), (20, 5)])
+def test_stochastic_oscillator_matches_pandas(bars, k_period, d_period):
+    actual = TechnicalIndicators.stochastic_oscillator(
+        bars["high"], bars["low"], bars["close"], k_period, d_period
+    )
+    expected = pandas_stochastic(bars["high"], bars["low"], bars["close"], k_period, d_period)
+    for a, e in zip(actual, expected):
+        assert_series_close(a, e)
+
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_commodity_channel_index_matches_pandas(bars, period):
+    actual = TechnicalIndicators.commodity_channel_index(
+        bars["high"], bars["low"], bars["close"], period
+    )
+    assert_series_close(actual, pandas_cci(bars["high"], bars["low"], bars["close"], period))
+
+
+@pytest.mark.parametrize("ma_type", ["sma", "ema", "wma"])
+@pytest.mark.parametrize("period", PERIODS)
+def test_moving_average_matches_pandas(bars, period, ma_type):
+    actual = TechnicalIndicators.moving_average(bars["close"], period, ma_type)
+    assert_series_close(actual, pandas_moving_average(bars["close"], period, ma_type))
+
+
+@pytest.mark.parametrize("period", [0, *PERIODS])
+def test_bollinger_bands_matches_pandas(bars, period):
+    actual = TechnicalIndicators.bollinger_bands(bars["close"], period, 2.0)
+    for a, e in zip(actual, pandas_bollinger(bars["close"], period, 2.0)):
+        assert_series_close(a, e)
+
+
+def test_bollinger_bands_track_a_large_price_level():
+    # Running sums over prices far from zero are where cancellation would show
+    close = 1e6 + make_bars(5 * _BB_RESYNC)["close"]
+    for a, e in zip(
+        TechnicalIndicators.bollinger_bands(close, 20, 2.0), pandas_bollinger(close, 20, 2.0)
+    ):
+        assert_series_close(a, e)
+
+
+@pytest.mark.parametrize("signal_periods", [(12, 26, 9), (1, 2, 1), (5, 35, 5)])
+def test_macd_matches_pandas(bars, signal_periods):
+    actual = TechnicalIndicators.macd(bars["close"], *signal_periods)
+    for a, e in zip(actual, pandas_macd(bars["close"], *signal_periods)):
+        assert_series_close(a, e)
+
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_rsi_matches_wilder_smoothing(bars, period):
+    actual = TechnicalIndicators.rsi(bars["close"], period)
+    expected = pd.Series(wilder_rsi(bars["close"].to_numpy(), period), index=bars.index)
+    assert_series_close(actual, expected)
+
+
+def test_rsi_reference_values():
+    # 14-period Wilder RSI worked example (StockCharts "RSI" ChartSchool spreadsheet)
+    close = pd.Series([
+        44.3389, 44.0902, 44.1497, 43.6124, 44.3278, 44.8264, 45.0955, 45.4245, 45.8433,
+        46.0826, 45.8931, 46.0328, 45.6140, 46.2820, 46.2820, 46.0028, 46.0328, 46.4116,
+        46.2222, 45.6439, 46.2122, 46.2521, 45.7137, 46.4515, 45.7835, 45.3548, 44.0288,
+        44.1783, 44.2181, 44.5672, 43.4205, 42.6628, 43.1314,
+    ])
+    expected = [
+        70.53, 66.32, 66.55, 69.41, 66.36, 57.97, 62.93, 63.26, 56.06, 62.38,
+        54.71, 50.42, 39.99, 41.46, 41.87, 45.46, 37.30, 33.08, 37.77,
+    ]
+    rsi = TechnicalIndicators.rsi(close, 14)
+    assert rsi.iloc[:14].isna().all()
+    np.testing.assert_allclose(rsi.iloc[14:].to_numpy(), expected, atol=0.005)
+
+
+def test_rsi_of_a_one_sided_series():
+    rising = pd.Series(np.arange(30, dtype=float))
+    assert (TechnicalIndicators.rsi(rising, 14).iloc[14:] == 100.0).all()
+    flat = pd.Series(np.full(30, 5.0))
+    assert TechnicalIndicators.rsi(flat, 14).isna().all()
+
+
+def test_calculate_all_indicators_matches_pandas(bars):
+    result = TechnicalIndicators.calculate_all_indicators(bars)
+    high, low, close = bars["high"], bars["low"], bars["close"]
+    stoch_k, stoch_d = pandas_stochastic(high, low, close, 14, 3)
+    bb_upper, bb_middle, bb_lower = pandas_bollinger(close, 20, 2.0)
+    macd_line, signal_line, histogram = pandas_macd(close, 12, 26, 9)
+    expected = {
+        "stoch_k": stoch_k,
+        "stoch_d": stoch_d,
+        "cci": pandas_cci(high, low, close, 20),
+        "rsi": pd.Series(wilder_rsi(close.to_numpy(), 14), index=bars.index),
+        "sma": pandas_moving_average(close, 20, "sma"),
+        "ema": pandas_moving_average(close, 20, "ema"),
+        "bb_upper": bb_upper,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_lower,
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_histogram": histogram,
+    }
+    pd.testing.assert_frame_equal(result[bars.columns], bars)
+    assert list(result.columns) == [*bars.columns, *expected]
+    for column, series in expected.items():
+        assert_series_close(result[column], series)
@@ -0,0 +1,32 @@
+import pytest
+
+from app import sentiment
+from app.sentiment import NewsSentimentAnalyzer
+
+
+CASES = [
+    ("Apple unveils a new iPhone", ["AAPL", "APP"], ["AAPL", "APP"]),
+    ("Meta earnings beat estimates", ["META", "MET"], ["META", "MET"]),
+    ("Microsoft Azure and Nvidia GPU demand", ["MSFT", "NVDA", "TSLA"], ["MSFT", "NVDA"]),
+    ("S&P 500 closes higher; small cap stocks lag", ["IWM", "SPY", "QQQ"], ["IWM", "SPY"]),
+    ("Nothing relevant here", ["AAPL", "MSFT"], []),
+    ("Apple unveils a new iPhone", [], []),
+]
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def matcher_backend(request, monkeypatch):
+    if request.param == "automaton":
+        if sentiment.ahocorasick is None:
+            pytest.skip("pyahocorasick is not installed")
+    else:
+        monkeypatch.setattr(sentiment, "ahocorasick", None)
+    sentiment._symbol_matcher.cache_clear()
+    yield request.param
+    sentiment._symbol_matcher.cache_clear()
+
+
+@pytest.mark.parametrize("text, symbols, expected", CASES)
+def test_extract_symbols_from_text(matcher_backend, text, symbols, expected):
+    analyzer = NewsSentimentAnalyzer.__new__(NewsSentimentAnalyzer)
+    assert analyzer._extract_symbols_from_text(text, symbols) == expected